@@ -8,52 +8,135 @@ LICENSE file in the root directory of this source tree.
 """
 
 import os
+import sys
 import logging
 import argparse
-from web.eliza.base_eliza import load_default_identity
-from web.eliza.base_eliza import load_identity_from_path
-from web.eliza.base_eliza import MultiAgentSession
+import asyncio
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 
 USERNAME_IN_CHAT = "You"
 
 
+def read_line(prompt=""):
+    """Read the line entered by the user (None on ctrl-c or end of input - ctrl-d).
+    Input is read in the main thread, so ctrl-c interrupts the read itself.
+    """
+    try:
+        return input(prompt)
+    except EOFError:
+        return None
+    except KeyboardInterrupt:
+        print()
+        return None
+
+
+def write_response(prefix, agent, msg):
+    """Write agent's response to console. If the agent provides optional
+    `stream(msg)` method (generator of response chunks), the chunks are written
+    as soon as they are produced, instead of waiting for the full response.
+    """
+    stream = getattr(agent, "stream", None)
+    if stream is None:
+        print(f"{prefix}{agent(msg)}")
+        return
+
+    sys.stdout.write(prefix)
+    sys.stdout.flush()
+    for chunk in stream(msg):
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    sys.stdout.write("\n")
+
+
 def single_agent_chat(agent):
     """Allows user interaction in console with a single chatbot (agent) in a loop:
     - start session with empty ("") message sent to the agent
     - read user message from console
     - get agent's response
     - write agent's response to console
-    - exit if user presses enter without any input (message length is 0)
+    - ask again (without calling the agent) if the message contains only whitespace
+    - exit if user presses enter without any input (message length is 0),
+      ctrl-c or ctrl-d
     """
+    agent_prefix = f"{agent.name()}: "
+    user_prefix = f"{USERNAME_IN_CHAT}: "
 
     print("\n<press enter with no message to exit>")
-    print(f"{agent.name()}: {agent('')}")
-    msg = input(f"{USERNAME_IN_CHAT}: ")
+    print(f"{agent_prefix}{agent('')}")
+    msg = read_line(user_prefix)
     while msg:
-        print(f"{agent.name()}: {agent(msg)}")
-        msg = input(f"{USERNAME_IN_CHAT}: ")
+        if not msg.isspace():
+            write_response(agent_prefix, agent, msg)
+        msg = read_line(user_prefix)
 
 
 def multi_agent_chat(*agents):
     """Runs interaction between multiple agents in a turn based conversation.
     User must press enter after each response to continue the process.
+    Waiting for the user to press enter and computing the next agent's response
+    (in a worker thread) run concurrently, unless log messages are displayed
+    (they would be written before the user continues).
     """
+    from web.eliza.base_eliza import MultiAgentSession
+
     session = MultiAgentSession(*agents)
+    n = len(agents)
+    ahead = not logging.getLogger().isEnabledFor(logging.INFO)
+    loop = asyncio.new_event_loop()
+
+    def next_turn():
+        """Get the next agent's response (`async` agents run in the loop)"""
+        return loop.run_until_complete(session.anext())
 
-    idx = 0
+    round_no, turn_in_round = 1, 0
     print("<press enter to continue; ctrl-c or q+enter to exit>")
     print()
-    while input() != "q":
-        if idx % len(agents) == 0:
-            print(f"****** Round #{int(idx/(len(agents)))+1} ******")
-            print()
-        name, msg = session.next()
-        if msg == None:
-            print(f"{name}: (END)")
-            break
+    with contextlib.closing(loop), ThreadPoolExecutor(max_workers=1) as executor:
+        turn = executor.submit(next_turn) if ahead else None
+        while True:
+            user_msg = read_line()
+            if user_msg is None or user_msg == "q":
+                break
+
+            # round header and the response are written to console at once
+            # (the header goes first if the turn is logged)
+            if turn_in_round == 0:
+                block = f"****** Round #{round_no} ******\n\n"
+            else:
+                block = ""
+            if ahead:
+                name, msg = turn.result()
+            else:
+                sys.stdout.write(block)
+                sys.stdout.flush()
+                block = ""
+                name, msg = next_turn()
+            if msg == None:
+                sys.stdout.write(f"{block}{name}: (END)\n")
+                sys.stdout.flush()
+                break
 
-        print(f"{name}: {msg}")
-        idx += 1
+            sys.stdout.write(f"{block}{name}: {msg}\n")
+            sys.stdout.flush()
+            turn_in_round += 1
+            if turn_in_round == n:
+                round_no, turn_in_round = round_no + 1, 0
+            if ahead:
+                turn = executor.submit(next_turn)
+
+
+def load_identity(identity):
+    """Load identity module given (name or path, type) tuple from `identity_type()`"""
+    from web.eliza.base_eliza import load_default_identity
+    from web.eliza.base_eliza import load_identity_from_path
+
+    identity_name, identity_type = identity
+    logging.info("Loading '%s' identity: %s", identity_type, identity_name)
+    if identity_type == "default":
+        return load_default_identity(identity_name)
+
+    return load_identity_from_path(identity_name)
 
 
 def identity_type(value):
@@ -99,26 +182,28 @@ if __name__ == "__main__":
     elif args.verbose >= 2:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    # identities are imported only for the branch that is actually taken
     if args.demo:
+        from web.eliza.base_eliza import load_default_identity
+
         eliza_identity = load_default_identity("eliza")
         patient_identity = load_default_identity("eliza_demo")
         multi_agent_chat(
             eliza_identity.create(name="Eliza"), patient_identity.create(name="Patient")
         )
     elif args.example:
+        from web.eliza.base_eliza import load_default_identity
+
         eliza_identity = load_default_identity("eliza")
         for msg in eliza_identity.example(args.example):
             print(msg)
     else:
-        identities = []
-        for identity_name, identity_type in args.identities:
-            logging.info(f"Loading '{identity_type}' identity: {identity_name}")
-            if identity_type == "default":
-                identity_module = load_default_identity(identity_name)
-            else:
-                identity_module = load_identity_from_path(identity_name)
-
-            identities.append(identity_module)
+        # each distinct identity is loaded once and reused by all its agents;
+        # the loads are independent, so they run in parallel
+        distinct = list(dict.fromkeys(args.identities))
+        with ThreadPoolExecutor(max_workers=min(8, len(distinct))) as executor:
+            loaded = dict(zip(distinct, executor.map(load_identity, distinct)))
+        identities = [loaded[identity] for identity in args.identities]
 
         if len(identities) >= 2:
             multi_agent_chat(*[i.create() for i in identities])
@@ -14,7 +14,12 @@ DEFAULT_NAME = "blank"
 """
 
 class Chatbot:
-    """Chatbot processing algorithm"""
+    """Chatbot processing algorithm
+
+    A chatbot may also provide an optional `stream(msg)` method - a generator
+    yielding the response in chunks (eg. word by word, as they are generated).
+    The console client writes each chunk as soon as it is produced.
+    """
 
     def __init__(self, name=DEFAULT_NAME):
         self._name = name
@@ -37,7 +42,7 @@ class Chatbot:
         """Return next message."""
 
         resp = None
-        logging.info(f"Response {self._idx+1}: {resp}")
+        logging.info("Response %d: %s", self._idx + 1, resp)
 
         self._idx += 1
         return str(resp)
@@ -15,28 +15,26 @@ DEFAULT_NAME = "blank"
 """Agent's default name
 """
 
-script = dict()
-
-script[KEYWORD_START] = {
-    "rules": [
-        {"reassembly": [
-            "MY KEYWORD_START ANSWER: I'm Blank! Feed my script!"]}
-    ]
-}
-
-script[KEYWORD_NONE] = {
-    "rules": [{
-        "reassembly": [
-            "MY KEYWORD_NONE ANSWER: I'm Blank! Feed my script!"
-        ]}]
-}
-
-script["MYKEYWORD"] = {
-    "rank": 0,
-    "rules": [{
-        "reassembly": [
-            "MYANSWER"
-        ]}]
+script = {
+    KEYWORD_START: {
+        "rules": [
+            {"reassembly": [
+                "MY KEYWORD_START ANSWER: I'm Blank! Feed my script!"]}
+        ]
+    },
+    KEYWORD_NONE: {
+        "rules": [{
+            "reassembly": [
+                "MY KEYWORD_NONE ANSWER: I'm Blank! Feed my script!"
+            ]}]
+    },
+    "MYKEYWORD": {
+        "rank": 0,
+        "rules": [{
+            "reassembly": [
+                "MYANSWER"
+            ]}]
+    },
 }
 
 
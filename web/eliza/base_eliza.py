@@ -8,12 +8,22 @@ LICENSE file in the root directory of this source tree.
 """
 
 import os
+import sys
 import logging
+import asyncio
+import inspect
+import itertools
 import importlib.util
 from importlib import import_module
 
 DEFAULT_IDENTITIES_PATH = "web.eliza.identities"
 
+_identities_by_path = {}
+"""Custom identity modules already loaded, by absolute path"""
+
+_custom_module_ids = itertools.count(1)
+"""Numbers for unique names of custom identity modules"""
+
 def load_default_identity(identity_name):
     module_path = f"{DEFAULT_IDENTITIES_PATH}.{identity_name}"
     try:
@@ -26,9 +36,23 @@ def load_default_identity(identity_name):
     return identity_module
 
 def load_identity_from_path(identity_path):
-    spec = importlib.util.spec_from_file_location('custom_module', identity_path)
+    """Load identity module from file (each file is executed only once).
+    The module is registered in `sys.modules` under a unique name."""
+    path = os.path.abspath(identity_path)
+    if path in _identities_by_path:
+        return _identities_by_path[path]
+
+    module_name = f"custom_module_{next(_custom_module_ids)}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
     custom_identity = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(custom_identity)
+    sys.modules[module_name] = custom_identity
+    try:
+        spec.loader.exec_module(custom_identity)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+
+    _identities_by_path[path] = custom_identity
     return custom_identity
 
 class MultiAgentSession:
@@ -40,17 +64,36 @@ class MultiAgentSession:
 
     def __init__(self, *agents):
         self._agents = agents
-        self._activeAgent = 0
+        self._names = [agent.name() for agent in agents]
+        self._calls = [agent.__call__ for agent in agents]
+        self._is_async = [inspect.iscoroutinefunction(call) for call in self._calls]
+        self._turns = itertools.cycle(range(len(agents)))
         self._message = ""
-        logging.debug(f"Number of agents: {len(agents)}")
+        logging.debug("Number of agents: %d", len(agents))
 
     def next(self):
-        logging.debug(
-            f"Active agent: {self._activeAgent+1} ({self._agents[self._activeAgent].name()})"
-        )
+        turn = self._next_turn()
+        return self._pass_message(turn, self._calls[turn](self._message))
+
+    async def anext(self):
+        """Asynchronous version of `next()` - agents with `async` __call__ are awaited
+        directly, blocking ones run in a worker thread, so the event loop stays free
+        (eg. to wait for user input) in the meantime
+        """
+        turn = self._next_turn()
+        if self._is_async[turn]:
+            message = await self._calls[turn](self._message)
+        else:
+            message = await asyncio.to_thread(self._calls[turn], self._message)
+        return self._pass_message(turn, message)
 
-        self._message = self._agents[self._activeAgent](self._message)
-        result = (self._agents[self._activeAgent].name(), self._message)
-        self._activeAgent = (self._activeAgent + 1) % len(self._agents)
+    def _next_turn(self):
+        """Switch to the next agent (agents take turns in the order they were given)"""
+        turn = next(self._turns)
+        logging.debug("Active agent: %d (%s)", turn + 1, self._names[turn])
+        return turn
 
-        return result
+    def _pass_message(self, turn, message):
+        """Store active agent's response (input for the next agent)"""
+        self._message = message
+        return (self._names[turn], message)
@@ -25,7 +25,8 @@ https://web.stanford.edu/class/linguist238/p36-weizenabaum.pdf
 import logging
 import doctest
 import re
-import copy
+import sys
+from collections import deque
 
 DEFAULT_NAME = "Eliza"
 """Agent's default name
@@ -46,6 +47,8 @@ tags = {
     "/NOUN": "mother|father",
 }
 """Tags are reused/evaluated within script decomposition (`regex`) rules
+- `/TAG` in a decomposition stands for any of the tag's words
+(expanded when the script is compiled, see `_expand_tags()`)
 """
 
 script = dict()
@@ -432,7 +435,7 @@ script["I"] = {
         },
         {
             # user input:           I    feel|think|believe|wish I
-            "decomposition": rf".*\byou ({tags['/BELIEF']}) you (.*)$",
+            "decomposition": r".*\byou (/BELIEF) you (.*)$",
             "reassembly": [
                 "Do you really think so",
                 r"But you are not sure you \2",
@@ -441,7 +444,7 @@ script["I"] = {
         },
         {
             # user input:           I         feel|think|believe|wish  I
-            "decomposition": rf".*\byou (.*)\b({tags['/BELIEF']}) (.*)\byou\b(.*)$",
+            "decomposition": r".*\byou (.*)\b(/BELIEF) (.*)\byou\b(.*)$",
             "reassembly": ["=YOU"],
         },
         {
@@ -572,7 +575,7 @@ script["MY"] = {
     "rules": [
         {
             # user input:           my    (wife|mother|sister)
-            "decomposition": rf"^.*\byour ({tags['/FAMILY']}).?\b(.*)$",
+            "decomposition": r"^.*\byour (/FAMILY).?\b(.*)$",
             "reassembly": [
                 "Tell me more about your family",
                 r"Who else in your family \2",
@@ -759,6 +762,288 @@ script["DIT"] = {
 }
 
 
+_TAG_RE = re.compile(r"/[A-Z]+")
+
+
+def _compile_rule(rule):
+    """Compile transformation rule (from `rules` or `memory`), so its patterns
+    aren't parsed (nor looked up in the `re` module cache) on every message:
+    - `decomposition` - regex with expanded tags, in lowercase (it's matched
+      with lowercase sentence, see `_lowercase()`), None if it isn't ASCII
+    - `ignorecase` - the same regex ignoring case (matched with the sentence
+      itself if it can't be lowercased)
+    - `anchored` - tells if the decomposition starts with `^`
+    - `reassembly` - templates (see `_compile_template()`) in the reassembly order
+    - `pre` - template of `pre` (None if the rule has none)
+    The rule itself is left intact.
+    """
+    pattern = _anchor_lines(_expand_tags(rule["decomposition"]))
+    ignorecase = re.compile(pattern, re.IGNORECASE)
+    groupindex = ignorecase.groupindex
+    return {
+        "decomposition": (
+            re.compile(_lowercase_pattern(pattern)) if pattern.isascii() else None
+        ),
+        "ignorecase": ignorecase,
+        "anchored": rule["decomposition"].startswith("^"),
+        "reassembly": tuple(
+            _compile_template(t, groupindex) for t in rule["reassembly"]
+        ),
+        "pre": _compile_template(rule["pre"], groupindex) if "pre" in rule else None,
+    }
+
+
+_compiled_rules = {}
+"""Compiled transformation rules (see `_compile_rule()`) by their decomposition,
+reassembly and `pre` - shared by all the chatbots, a rule changed in the script
+is just compiled again
+"""
+
+
+def _get_compiled(rule):
+    """Get compiled transformation rule (compile it if it's new or has been
+    changed since it was compiled)
+    """
+    source = (rule["decomposition"], tuple(rule["reassembly"]), rule.get("pre"))
+    compiled = _compiled_rules.get(source)
+    if compiled is None:
+        compiled = _compiled_rules[source] = _compile_rule(rule)
+
+    return compiled
+
+
+def _redirection(properties):
+    """Keyword redirected to, if keyword's rules are just a single `=` redirection
+    (one reassembly, no decomposition and no `pre`), None otherwise
+    >>> _redirection(script["MACHINE"])
+    'COMPUTER'
+    >>> _redirection(script["COMPUTER"]) is None
+    True
+    """
+    rules = properties.get("rules")
+    if (
+        rules
+        and len(rules) == 1
+        and "decomposition" not in rules[0]
+        and "pre" not in rules[0]
+    ):
+        reassembly = rules[0]["reassembly"]
+        if len(reassembly) == 1 and reassembly[0].startswith("="):
+            return reassembly[0][1:].upper()
+
+    return None
+
+
+def _always_responds(transformation_rules):
+    """Tell if the transformation rules always generate a response
+    - a rule without decomposition is reached and none of the rules before it
+    (including itself) redirects to another keyword (`=`) or drops the keyword
+    (`NEWKEY`)
+    """
+    for rule in transformation_rules:
+        if _redirects(rule):
+            return False
+        if "decomposition" not in rule:
+            return True
+
+    return False
+
+
+def _redirects(rule):
+    """Tell if any of the rule's reassemblies redirects to another keyword (`=`)
+    or drops the keyword (`NEWKEY`)
+    """
+    return any(r.startswith("=") or r == "NEWKEY" for r in rule["reassembly"])
+
+
+def _resolve_alias(script, keyword):
+    """Follow `=` redirections of the keyword (eg. MACHINE => COMPUTER)
+    and return the keyword whose rules actually generate a response.
+    The chain is left unresolved (keyword itself is returned) if it leads
+    to a keyword without rules or back to a keyword already visited.
+    >>> _resolve_alias(script, "MACHINE")
+    'COMPUTER'
+    >>> Chatbot()._aliases["MACHINE"]
+    'COMPUTER'
+    """
+    seen = {keyword}
+    target = keyword
+    redirection = _redirection(script[target])
+    while redirection is not None:
+        if redirection in seen or "rules" not in script.get(redirection, {}):
+            return keyword
+        seen.add(redirection)
+        target = redirection
+        redirection = _redirection(script[target])
+
+    return target
+
+
+def _expand_tags(decomposition):
+    """Replace tags in decomposition with alternatives of their words
+    >>> _expand_tags(r"your (/NOUN)")
+    'your ((?:mother|father))'
+    """
+
+    def expand(match):
+        tag = match.group()
+        return f"(?:{tags[tag]})" if tag in tags else tag
+
+    return _TAG_RE.sub(expand, decomposition)
+
+
+_PATTERN_PARTS_RE = re.compile(
+    r"\\N\{[^}]*\}|\\.|\(\?P<\w+>|\(\?P=\w+\)|\(\?\(\w+\)"
+    r"|\(\?[aiLmsux]*(?:-[imsx]*)?[:)]|([^\\(]+)|\(",
+    re.DOTALL,
+)
+"""Escape sequence, group name, inline flags or a text without them
+(the only part to lowercase) in regex pattern
+"""
+
+
+def _lowercase_pattern(pattern):
+    """Lowercase regex pattern, except escape sequences (eg. `\\B`, `\\S`),
+    group names and inline flags
+    >>> _lowercase_pattern(r"(?P<Thing>.*) IS \\B(?P=Thing)(?i:X)")
+    '(?P<Thing>.*) is \\\\B(?P=Thing)(?i:x)'
+    """
+    return _PATTERN_PARTS_RE.sub(
+        lambda m: m.group().lower() if m.group(1) else m.group(), pattern
+    )
+
+
+def _anchor_lines(pattern):
+    """Decomposition starting with `.*` (not anchored with `^`) and ending
+    with `$` can only match from the start of the sentence (or of a line
+    in it) - a match starting anywhere else could be extended to the left.
+    Anchor it there, so `search()` doesn't try (and fail) to match it from
+    every position in the sentence - for decompositions with more `.*`
+    (eg. `.*\\byou (.*)\\b(/BELIEF) (.*)\\byou\\b(.*)$`) it makes a difference
+    between square and cubic time in sentence length.
+    """
+    if pattern.startswith(".*") and pattern.endswith("$") and pattern[-2:-1] != "\\":
+        return r"(?:^|(?<=\n))" + pattern
+
+    return pattern
+
+
+def _lowercase(text):
+    """Lowercase ASCII text (None if the text isn't ASCII).
+    Decompositions are matched with lowercase sentence instead of ignoring case
+    by regex engine (the response is built with the original text - the spans
+    of matches are the same in both). Outside ASCII the regex engine folds case
+    its own way (eg. `İ` matches `i`), so other sentences are matched ignoring
+    case (see `_regex()`).
+    """
+    return text.lower() if text.isascii() else None
+
+
+def _regex(compiled, sentence, lowered):
+    """Decomposition regex of the compiled rule (see `_compile_rule()`)
+    and the text to match it with, given `lowered` - the sentence in lowercase
+    (see `_lowercase()`)
+    """
+    if lowered is None or compiled["decomposition"] is None:
+        return compiled["ignorecase"], sentence
+
+    return compiled["decomposition"], lowered
+
+
+def _sub(regex, template, sentence, text):
+    """Same as `regex.sub(template, sentence)` (ignoring case), given `text`
+    - the sentence to match the regex with (see `_regex()`)
+    """
+    parts = []
+    pos = 0
+    for match in regex.finditer(text):
+        parts.append(sentence[pos : match.start()])
+        parts.append(_expand(match, template, sentence))
+        pos = match.end()
+    parts.append(sentence[pos:])
+
+    return "".join(parts)
+
+
+def _reassemble(compiled, match, template, sentence):
+    """Same as `re.sub(rule["decomposition"], template, sentence)` (`compiled`
+    - the rule compiled by `_compile_rule()`), but reuses
+    the match already found by `search()`. A decomposition anchored with `^`
+    can match only once (at the start), so only the matched part of the
+    sentence is replaced - there's no need to scan the sentence again.
+    """
+    if compiled["anchored"]:
+        return _expand(match, template, sentence) + sentence[match.end() :]
+
+    return _sub(match.re, template, sentence, match.string)
+
+
+_TEMPLATE_PARTS_RE = re.compile(
+    r"\\(?:([1-9])(?![0-9])|g<(\w+)>)|((?:\\.|[^\\])+?)(?=\\[1-9g]|\Z)", re.DOTALL
+)
+"""Group reference (`\\1`-`\\9`, `\\g<...>`) or a literal text
+(with other escapes) in reassembly template
+"""
+
+_EMPTY_MATCH = re.match("", "")
+"""Match without groups - expands escapes in literal text of templates"""
+
+
+def _compile_template(template, groupindex=None):
+    """Split reassembly template into literal strings and group numbers, eg.
+    >>> _compile_template(r"Why do you remember \\1 just now")
+    ('Why do you remember ', 1, ' just now')
+    >>> _compile_template(r"Why \\g<Thing>?\\n", {"Thing": 1})
+    ('Why ', 1, '?\\n')
+
+    `groupindex` maps group names to numbers (see `re.Pattern.groupindex`).
+    Returns the template itself if it can't be split (eg. `\\10`,
+    unknown group name).
+    """
+    parts = []
+    for match in _TEMPLATE_PARTS_RE.finditer(template):
+        number, name, literal = match.groups()
+        if literal is not None:
+            try:
+                parts.append(_EMPTY_MATCH.expand(literal))
+            except re.error:
+                return template
+        elif number is not None:
+            parts.append(int(number))
+        elif name.isdigit():
+            parts.append(int(name))
+        elif name in (groupindex or {}):
+            parts.append(groupindex[name])
+        else:
+            return template
+
+    return tuple(p for p in parts if p != "")
+
+
+def _expand(match, template, sentence):
+    """Same as `match.expand(template)` for template compiled by
+    `_compile_template()`, but the groups are taken from the original `sentence`
+    (the match is found in lowercase sentence). Templates which couldn't be
+    compiled are expanded by `match.expand()` (groups in lowercase).
+    """
+    if template.__class__ is str:
+        return match.expand(template)
+
+    # span of a group which didn't participate in the match is (-1, -1)
+    return "".join(
+        [p if p.__class__ is str else sentence[slice(*match.span(p))] for p in template]
+    )
+
+
+_TOKEN_RE = re.compile(r"[^ .,?!;]+|[.,?!;]")
+"""Token - a word (anything between spaces and punctuation marks)
+or a single punctuation mark
+"""
+
+_SENTENCE_RE = re.compile(r"[^.,?]+")
+"""Sentence - non-empty text between sentence delimiters"""
+
+
 class Chatbot:
     """ELIZA - algorithm implementation."""
 
@@ -766,12 +1051,63 @@ class Chatbot:
         self._name = name
         """Chatbot name (may be used in chat)
         """
-        self._script = copy.deepcopy(data)
-        """Local copy of the script is required,
-        because the script is modified be the chatbot
+        self._script = data
+        """Script is shared by all the chatbots using it - the chatbot doesn't
+        modify it
+        """
+        self._cursors = {}
+        """Index of the next reassembly to use (see `_next_index()`)
+        by `id()` of the transformation rule
         """
-        self._memstack = []
-        """Memory Stack - list of responses created during conversation,
+        keywords = [
+            k
+            for k, v in self._script.items()
+            if ("rules" in v or "=" in v) and k.upper() == k
+        ]
+        # everything that depends on other keywords is worked out against
+        # the chatbot's own script (keyword properties may be shared)
+        rule_keywords = [k for k in keywords if "rules" in self._script[k]]
+        self._aliases = {}
+        """Keywords which only redirect to another keyword, with the final
+        keyword of the redirection chain (see `_resolve_alias()`)
+        """
+        for k in rule_keywords:
+            alias = _resolve_alias(self._script, k)
+            if alias != k:
+                self._aliases[k] = alias
+        max_rank = max(
+            [self._script[k].get("rank", 0) for k in rule_keywords], default=0
+        )
+        self._keywords = {}
+        """Keywords with rules or substitutions and what the sentence scan needs
+        to know about them: keyword with rules (None - substitution only), rank,
+        substitution (`=`, None - no substitution) and if the keyword ends
+        keyword detection on top of the keystack (keyword of the highest rank
+        which always responds)
+        """
+        for k in keywords:
+            properties = self._script[k]
+            rank = properties.get("rank", 0)
+            self._keywords[k] = (
+                k if "rules" in properties else None,
+                rank,
+                sys.intern(properties["="]) if "=" in properties else None,
+                "rules" in properties
+                and rank == max_rank
+                and _always_responds(self._get_rules(k)),
+            )
+        self._simple_keywords = {
+            k for k in rule_keywords if not any(map(_redirects, self._get_rules(k)))
+        }
+        """Keywords which never redirect nor drop the keyword (see `_redirects()`)"""
+        self._start_rules = self._script.get(KEYWORD_START, {}).get("rules")
+        """Rules of the session start (welcome message)"""
+        self._none_rules = self._script.get(KEYWORD_NONE, {}).get("rules")
+        """Rules of the fallback, used when no other response could be generated"""
+        self._last_input = (None, None)
+        """Last message and its processed input (keystack and altered sentence)"""
+        self._memstack = deque()
+        """Memory Stack - queue of responses created during conversation,
         used when response couldn't be generated using transformation rules
         """
 
@@ -789,13 +1125,21 @@ class Chatbot:
         # handle start of a session
         if msg == KEYWORD_START or msg is None:
             logging.debug("Empty input - use welcome message")
-            keyword_rules = self._get_rules(KEYWORD_START)
-            resp, _ = self._get_response(keyword_rules, msg)
+            resp, _ = self._get_response(self._start_rules, msg)
             return str(resp)
 
         logging.info("Message: '%s'", msg)
 
-        keystack, altered_sentence = self._process_input(msg)
+        # the same message gives the same keystack and altered sentence
+        # (only the response may differ - reassemblies are rotated),
+        # but it's processed again if its steps are logged
+        log_info = logging.getLogger().isEnabledFor(logging.INFO)
+        if self._last_input[0] == msg and not log_info:
+            logging.debug("\tSame message as before - reuse processed input")
+            keystack, altered_sentence = self._last_input[1]
+        else:
+            keystack, altered_sentence = self._process_input(msg)
+            self._last_input = (msg, (keystack, altered_sentence))
 
         # NATURAL LANGUAGE GENERATION
         # try to generate response given the keystack
@@ -819,17 +1163,21 @@ class Chatbot:
         # TEXT SEGMENTATION
         # Only single phrases or sentences are used for transformation
         all_sentences = self._get_sentences(msg)
-        logging.info(
-            "\tText segmentation: %s", ", ".join([f"'{s}'" for s in all_sentences])
-        )
+        # log messages which are costly to format are built only if they are logged
+        log_info = logging.getLogger().isEnabledFor(logging.INFO)
+        if log_info:
+            logging.info(
+                "\tText segmentation: %s", ", ".join([f"'{s}'" for s in all_sentences])
+            )
 
         keystack, altered_sentence = None, None
         for sentence in all_sentences:
             logging.info("\tProcessing sentence: '%s'", sentence)
 
             # TOKENIZATION
-            tokens = list(self._get_tokens(sentence))
-            logging.info("\tTokens: %s", ", ".join([f"'{t}'" for t in tokens]))
+            tokens = self._get_tokens(sentence)
+            if log_info:
+                logging.info("\tTokens: %s", ", ".join([f"'{t}'" for t in tokens]))
 
             # KEYWORDS DETECTION (FEATURE EXTRACTION, INTENT CLASSIFICATION)
             keystack, altered_sentence = self._scan_sentence(tokens)
@@ -846,47 +1194,50 @@ class Chatbot:
         If script defines a substitution it is performed here.
 
         Returns keystack ordered by the keyword order and priority
-        and list of tokens after substitution.
+        and the sentence after substitution.
         """
+        keywords = self._keywords
         keystack = None
-        altered_tokens = []
-        for token in tokens:
-            key = token.upper()
-            if key not in self._script:
-                altered_tokens.append(token)
+        detect = True
+        altered_tokens = list(tokens)
+        for idx, token in enumerate(tokens):
+            entry = keywords.get(token.upper())
+            if entry is None:
                 continue
 
-            if "=" in self._script[key]:
-                token_repl = self._script[key]["="]
-                altered_tokens.append(token_repl)
-                logging.debug(
-                    "\t\tSubstitution: '%s' => '%s' " "(altered sentence: '%s')",
-                    token,
-                    token_repl,
-                    " ".join(altered_tokens),
-                )
-            else:
-                altered_tokens.append(token)
+            keyword, rank, token_repl, final = entry
+            if token_repl is not None:
+                altered_tokens[idx] = token_repl
+                logging.debug("\t\tSubstitution: '%s' => '%s'", token, token_repl)
+
+            if not detect or keyword is None:
+                continue
 
-            if "rules" in self._script[key]:
-                rank = self._script[key].get("rank", 0)
-                if keystack is None:
-                    keystack = [(key, rank)]
-                elif rank > keystack[0][1]:
-                    keystack.insert(0, (key, rank))
-                else:
-                    keystack.append((key, rank))
+            # keyword with a higher rank than the top one goes on top,
+            # any other - to the bottom (keystack isn't sorted by rank)
+            if keystack is None:
+                keystack = deque([(keyword, rank)])
+            elif rank > keystack[0][1]:
+                keystack.appendleft((keyword, rank))
+            else:
+                keystack.append((keyword, rank))
+                continue
 
-        if keystack:
-            keyword_rank = ", ".join(
-                [f"'{keyword}' (rank: {rank})" for keyword, rank in keystack]
-            )
-        else:
-            keyword_rank = "-"
+            # the remaining keywords would never be used if the top keyword
+            # can't be replaced and always responds (only substitutions are left)
+            detect = not final
 
         altered_sentence = " ".join(altered_tokens)
 
-        logging.info("\tKeystack (detected keywords): %s", keyword_rank)
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            if keystack:
+                keyword_rank = ", ".join(
+                    [f"'{keyword}' (rank: {rank})" for keyword, rank in keystack]
+                )
+            else:
+                keyword_rank = "-"
+
+            logging.info("\tKeystack (detected keywords): %s", keyword_rank)
         logging.debug("\tAltered sentence: '%s'", altered_sentence)
 
         return keystack, altered_sentence
@@ -925,6 +1276,15 @@ class Chatbot:
         if keystack is None:
             return ""
 
+        # a single keyword without redirections - its response is the final one
+        if len(keystack) == 1 and keystack[0][0] in self._simple_keywords:
+            keyword = keystack[0][0]
+            logging.info("\tProcessing rules associated with keyword: '%s'", keyword)
+            resp, _ = self._get_response(self._get_rules(keyword), altered_sentence)
+            if resp != "":
+                logging.info("\tFound response for keyword: '%s'", keyword)
+            return resp
+
         for keyword, _ in keystack:
             logging.info("\tProcessing rules associated with keyword: '%s'", keyword)
             # find a response based on the keyword and altered user input
@@ -939,11 +1299,12 @@ class Chatbot:
                 while resp.startswith("="):
                     logging.debug("\t\tRedirecting: %s%s", keyword, resp)
                     if "pre" in rule:
-                        altered_sentence = re.sub(
-                            rule["decomposition"],
-                            rule["pre"],
-                            altered_sentence,
-                            flags=re.IGNORECASE,
+                        compiled = _get_compiled(rule)
+                        regex, text = _regex(
+                            compiled, altered_sentence, _lowercase(altered_sentence)
+                        )
+                        altered_sentence = _sub(
+                            regex, compiled["pre"], altered_sentence, text
                         )
                         logging.debug(
                             "\t\tPRE before redirect: %s " "(altered sentence: '%s')",
@@ -979,26 +1340,28 @@ class Chatbot:
         resp = ""
         # try to use memory
         if len(self._memstack) > 0:
-            resp = self._memstack.pop(0)
+            resp = self._memstack.popleft()
             logging.debug("\t\tFallback: Use response from memstack")
         # and if there are no responses in memory,
-        elif KEYWORD_NONE in script:
+        elif self._none_rules is not None:
             # use default responses associated with special KEYWORD_NONE
             logging.info("\t\tFallback: Use response from KEYWORD_NONE")
-            kw_rules = self._get_rules(KEYWORD_NONE)
-            resp, _ = self._get_response(kw_rules, "")
+            resp, _ = self._get_response(self._none_rules, "")
         else:
             logging.error("\t\tNo fallback: missing KEYWORD_NONE in script")
 
         return resp
 
     def _get_rules(self, keyword):
-        """Get list of transformation rules for the given keyword"""
+        """Get list of transformation rules for the given keyword
+        (rules of the redirection target for keywords which are just aliases)
+        """
         keyword = keyword.upper()
         if "rules" not in self._script.get(keyword):
             logging.error("No rules associated with keyword: '%s'", keyword)
             return None
 
+        keyword = self._aliases.get(keyword, keyword)
         return self._script[keyword]["rules"]
 
     def _get_response(self, transformation_rules, altered_sentence):
@@ -1010,6 +1373,9 @@ class Chatbot:
         if transformation_rules is None:
             return "", None
 
+        # decompositions are in lowercase
+        lowered = _lowercase(altered_sentence or "")
+
         # get first matching decomposition rule for the given keyword
         for rule in transformation_rules:
             # if there is no decomposition defined, go straight to the answers
@@ -1018,57 +1384,62 @@ class Chatbot:
                     "\t\tNo decomposition defined " "for rule (use top answer)"
                 )
                 # use top answer from the list and move it to the end (rotate)
-                resp = rule["reassembly"].pop(0)
-                rule["reassembly"].append(resp)
+                resp = rule["reassembly"][self._next_index(rule)]
                 return resp, rule
 
             # if decomposition rule exists and matches the user input
-            elif re.search(
-                rule["decomposition"], altered_sentence, flags=re.IGNORECASE
-            ):
+            compiled = _get_compiled(rule)
+            regex, text = _regex(compiled, altered_sentence, lowered)
+            match = regex.search(text)
+            if match:
                 logging.debug('\t\tDecomposition matched: r"%s"', rule["decomposition"])
                 # get the top reassembly rule and move it to the end (rotate)
-                trans = rule["reassembly"].pop(0)
-                rule["reassembly"].append(trans)
+                idx = self._next_index(rule)
+                trans = rule["reassembly"][idx]
                 # generate response
-                #             pattern                replacement    input string
-                resp = re.sub(
-                    rule["decomposition"], trans, altered_sentence, flags=re.IGNORECASE
-                )
-                logging.debug(
-                    "\t\tTransformation: "
-                    're.sub(r"%s", "%s", "%s", flags=re.IGNORECASE)',
-                    rule["decomposition"],
-                    trans.replace('"', r"\""),
-                    altered_sentence.replace('"', r"\""),
+                resp = _reassemble(
+                    compiled, match, compiled["reassembly"][idx], altered_sentence
                 )
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug(
+                        "\t\tTransformation: "
+                        're.sub(r"%s", "%s", "%s", flags=re.IGNORECASE)',
+                        regex.pattern,
+                        trans.replace('"', r"\""),
+                        altered_sentence.replace('"', r"\""),
+                    )
 
                 return resp, rule
 
         return "", None
 
+    def _next_index(self, rule):
+        """Get index of the top reassembly of the rule and move it to the end
+        (rotate). The list itself is left intact, only chatbot's index
+        of the top one changes.
+        """
+        # the reassembly list may have been shortened since the last use
+        idx = self._cursors.get(id(rule), 0) % len(rule["reassembly"])
+        self._cursors[id(rule)] = (idx + 1) % len(rule["reassembly"])
+        return idx
+
     def _get_tokens(self, text):
         """Split text into tokens, keeping punctuation marks as separate tokens
         >>> list(Chatbot()._get_tokens("I'm first. second. You're"))
         ["I'm", 'first', '.', 'second', '.', "You're"]
         """
 
-        token = []
-        for c in text:
-            if c == " ":
-                if len(token) > 0:
-                    yield "".join(token)
-                    token = []
-            elif c in ".,?!;":
-                if len(token) > 0:
-                    yield "".join(token)
-                    token = []
-                yield c
-            else:
-                token.append(c)
+        # text without punctuation marks (most sentences) is just split on spaces
+        if (
+            "." not in text
+            and "," not in text
+            and "?" not in text
+            and "!" not in text
+            and ";" not in text
+        ):
+            return [token for token in text.split(" ") if token]
 
-        if len(token) > 0:
-            yield "".join(token)
+        return _TOKEN_RE.findall(text)
 
     def _get_sentences(self, text):
         """Text segmentation - split text into sentences
@@ -1078,8 +1449,11 @@ class Chatbot:
         ['first', ' second']
         """
 
-        sentences = [s for s in re.split(r"[\.\,\?]", text) if len(s) > 0]
-        return sentences
+        # most messages are a single phrase - no need to run the regex
+        if "." not in text and "," not in text and "?" not in text:
+            return [text] if text else []
+
+        return _SENTENCE_RE.findall(text)
 
 
 def create(name=DEFAULT_NAME):
@@ -10,13 +10,12 @@ LICENSE file in the root directory of this source tree.
 
 import logging
 import doctest
-import copy
 
 DEFAULT_NAME = "Patient"
 """Agent's default name
 """
 
-script = [
+script = (
     "hello Eliza, nice to meet you. how are you?",
     "no",
     "no",
@@ -31,7 +30,10 @@ script = [
     "because my children have fun talking to chatbots",
     "you remind me of a family member",
     "hmm",
-]
+)
+"""Messages are only read by the chatbot, so the script is an immutable tuple
+shared by all agents
+"""
 
 
 class Chatbot:
@@ -41,9 +43,8 @@ class Chatbot:
         self._name = name
         """Chatbot name (may be used in chat)
         """
-        self._script = copy.deepcopy(data)
-        """Local copy of the script is required,
-        because the script is modified be the chatbot
+        self._script = data
+        """Reference to the script (not a copy) - the chatbot never modifies it
         """
         self._idx = 0
         """Current message index
@@ -66,7 +67,7 @@ class Chatbot:
 
         resp = self._script[self._idx]
 
-        logging.info(f"Response {self._idx+1} / {len(self._script)}: {resp}")
+        logging.info("Response %d / %d: %s", self._idx + 1, len(self._script), resp)
 
         self._idx += 1
         return str(resp)
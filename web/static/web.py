@@ -16,6 +16,9 @@ USERNAME = "You"
 CHAT_WINDOW = "chat-window"
 INPUT_ID = "user-input"
 
+input_element = None
+"""User input element (looked up once, in `main()`)"""
+
 
 class HTMLStream:
     def __init__(self, target=CHAT_WINDOW):
@@ -37,7 +40,7 @@ def start(evt=None):
     display("", target=CHAT_WINDOW, append=False)
     eliza_agent = eliza.create()
     display(f"{eliza_agent.name()}: {eliza_agent.start()}", target=CHAT_WINDOW)
-    js.document.getElementById(INPUT_ID).focus()
+    input_element.focus()
 
 def demo(evt=None):
     display("", target=CHAT_WINDOW, append=False)
@@ -45,18 +48,31 @@ def demo(evt=None):
         eliza.create(name="Therapist"), eliza_demo.create(name="Patient")
     )
 
+    # the whole conversation is displayed at once (one DOM update),
+    # unless log messages are displayed too (in between the lines)
+    batch = not logging.getLogger().isEnabledFor(logging.INFO)
+    lines = []
+
+    def write(line):
+        if batch:
+            lines.append(line)
+        else:
+            display(line, target=CHAT_WINDOW)
+
     idx = 0
     while True:
         if idx % 2 == 0:
-            display(f"****** Round #{int(idx/2)+1} ******", target=CHAT_WINDOW)
+            write(f"****** Round #{int(idx/2)+1} ******")
         name, msg = session.next()
         if msg == None:
-            display(f"{name}: (END)", target=CHAT_WINDOW)
+            write(f"{name}: (END)")
             break
 
-        display(f"{name}: {msg}", target=CHAT_WINDOW)
+        write(f"{name}: {msg}")
         idx += 1
 
+    if lines:
+        display("\n".join(lines), target=CHAT_WINDOW)
     scrollToBottom()
 
 
@@ -77,15 +93,15 @@ def set_logging(evt=None):
 def get_answer(evt=None):
     global eliza_agent
 
-    user_msg = Element(INPUT_ID).value.strip()
+    user_msg = input_element.value.strip()
     if len(user_msg) > 0:
         display(f"{USERNAME}: {user_msg}", target=CHAT_WINDOW)
         answer = eliza_agent(user_msg)
         display(f"{eliza_agent.name()}: {answer}", target=CHAT_WINDOW)
-        Element(INPUT_ID).clear()
+        input_element.value = ""
 
     scrollToBottom()
-    js.document.getElementById(INPUT_ID).focus()
+    input_element.focus()
 
 
 def on_user_input_keypress(evt):
@@ -94,9 +110,7 @@ def on_user_input_keypress(evt):
 
 
 def set_event_listeners():
-    js.document.getElementById(INPUT_ID).addEventListener(
-        "keypress", create_proxy(on_user_input_keypress)
-    )
+    input_element.addEventListener("keypress", create_proxy(on_user_input_keypress))
     js.document.getElementById("btn-demo").addEventListener("click", create_proxy(demo))
     js.document.getElementById("btn-send").addEventListener(
         "click", create_proxy(get_answer)
@@ -114,6 +128,11 @@ def set_event_listeners():
 
 
 def main():
+    global input_element
+
+    # elements used on every message are looked up once
+    input_element = js.document.getElementById(INPUT_ID)
+
     html_stream = logging.StreamHandler(HTMLStream(CHAT_WINDOW))
     formatter = logging.Formatter("%(levelname)s: %(message)s")
     html_stream.setFormatter(formatter)
@@ -8,7 +8,6 @@ LICENSE file in the root directory of this source tree.
 """
 import os
 import http.server
-import socketserver
 import webbrowser
 
 PORT = 8000
@@ -18,6 +17,7 @@ url = f'http://localhost:{PORT}'
 webbrowser.open(url)
 
 handler = http.server.SimpleHTTPRequestHandler
-with socketserver.TCPServer(("", PORT), handler) as httpd:
+# the browser fetches the client files in parallel - serve them concurrently
+with http.server.ThreadingHTTPServer(("", PORT), handler) as httpd:
     print(f"Serving ELIZA web client at: {url}")
     httpd.serve_forever()